@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Convert the trained Keras LSTM model to INT8, FP16 and dynamic range TensorFlow Lite models
+"""
+import argparse
+import os
+
+import numpy as np
+
+FEATURE_COLUMNS = [
+    "temperature",
+    "humidity",
+    "populationDensity",
+    "previousCases",
+    "wastewaterLevels",
+    "socialMediaSentiment"
+]
+SEQUENCE_LENGTH = 7
+
+def unroll_recurrent_layers(model):
+    """Clone the model with its recurrent layers unrolled over the fixed sequence length"""
+    from tensorflow import keras
+    
+    # A symbolic LSTM loop needs a TensorList with a static element shape, which the
+    # converter can't get from a model with a dynamic batch dimension
+    def clone_layer(layer):
+        config = layer.get_config()
+        if "unroll" in config:
+            config["unroll"] = True
+        return layer.__class__.from_config(config)
+    
+    unrolled = keras.models.clone_model(model, clone_function=clone_layer)
+    unrolled.set_weights(model.get_weights())
+    return unrolled
+
+def check_shapes(model, scaler):
+    """Exit with a clear message if the model or scaler don't match FEATURE_COLUMNS"""
+    num_features = len(FEATURE_COLUMNS)
+    if getattr(scaler, "n_features_in_", num_features) != num_features:
+        raise SystemExit(
+            f"❌ Scaler was fitted on {scaler.n_features_in_} features, expected {num_features}: "
+            f"{', '.join(FEATURE_COLUMNS)}"
+        )
+    if tuple(model.input_shape[1:]) != (SEQUENCE_LENGTH, num_features):
+        raise SystemExit(
+            f"❌ Model expects input shape {tuple(model.input_shape[1:])}, "
+            f"expected ({SEQUENCE_LENGTH}, {num_features})"
+        )
+
+def load_calibration_features(scaler, data_path: str, num_samples: int) -> np.ndarray:
+    """Load scaled feature rows used to calibrate the INT8 ranges"""
+    if data_path and os.path.exists(data_path):
+        import pandas as pd
+        features = pd.read_csv(data_path)[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+        print(f"✅ Loaded {len(features)} historical rows from {data_path}")
+        rng = np.random.default_rng(42)
+        if len(features) > num_samples:
+            features = features[rng.choice(len(features), num_samples, replace=False)]
+    else:
+        # No history available: sample uniformly inside the range the scaler was fitted on
+        print("⚠️ No historical data provided, sampling calibration rows from the scaler range")
+        rng = np.random.default_rng(42)
+        if hasattr(scaler, "data_min_"):
+            low, high = scaler.data_min_, scaler.data_max_
+        else:
+            low, high = scaler.mean_ - 2 * scaler.scale_, scaler.mean_ + 2 * scaler.scale_
+        features = rng.uniform(low, high, size=(num_samples, len(FEATURE_COLUMNS)))
+
+    return scaler.transform(features).astype(np.float32)
+
+def convert_int8(model, calibration: np.ndarray) -> bytes:
+    """Run full-integer post-training quantization"""
+    import tensorflow as tf
+
+    def representative_dataset():
+        # Same sequence construction as preprocess_input in main-lstm.py
+        for row in calibration:
+            yield [np.tile(row, (SEQUENCE_LENGTH, 1)).reshape(1, SEQUENCE_LENGTH, len(row))]
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+    return converter.convert()
+
+def convert_fp16(model) -> bytes:
+    """Quantize weights to float16, keeping float kernels for x86 hosts"""
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.target_spec.supported_types = [tf.float16]
+    return converter.convert()
+
+def convert_dynrange(model) -> bytes:
+    """Quantize weights to int8 while keeping float activations; needs no calibration"""
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    return converter.convert()
+
+def save_model(tflite_model: bytes, output_path: str):
+    """Write a converted model and report its size"""
+    with open(output_path, "wb") as f:
+        f.write(tflite_model)
+    print(f"✅ Saved {output_path} ({len(tflite_model) / 1024:.1f} KB)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="models/lstm_outbreak_model.h5")
+    parser.add_argument("--scaler", default="models/scaler.pkl")
+    parser.add_argument("--data", default=None, help="CSV of historical feature rows for calibration")
+    parser.add_argument("--samples", type=int, default=300, help="Number of calibration samples")
+    parser.add_argument("--output-dir", default="models")
+    args = parser.parse_args()
+
+    import joblib
+    from tensorflow import keras
+
+    print("🔧 Converting LSTM model to TFLite...")
+    print("=" * 50)
+
+    # Only inference is needed, so skip restoring the training loss and optimizer
+    model = keras.models.load_model(args.model, compile=False)
+    scaler = joblib.load(args.scaler)
+    print(f"   Keras size: {os.path.getsize(args.model) / 1024:.1f} KB")
+    check_shapes(model, scaler)
+    model = unroll_recurrent_layers(model)
+
+    # INT8 for ARM hosts, where the integer kernels are well optimized
+    calibration = load_calibration_features(scaler, args.data, args.samples)
+    print(f"📊 Calibration samples: {len(calibration)}")
+    save_model(convert_int8(model, calibration), os.path.join(args.output_dir, "lstm_int8.tflite"))
+
+    # FP16 for x86 hosts, where INT8 LSTM kernels are slower than float ones
+    save_model(convert_fp16(model), os.path.join(args.output_dir, "lstm_fp16.tflite"))
+
+    # Dynamic range (int8 weights, float activations) for hosts we can't identify
+    save_model(convert_dynrange(model), os.path.join(args.output_dir, "lstm_dynrange.tflite"))
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,17 @@ import os
 from datetime import datetime
 import logging
 
+# Compile the simulation math with Numba when it is installed
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Fallback decorator that leaves the function uncompiled"""
+        return lambda func: func
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -106,6 +117,11 @@ async def startup_event():
         
         model_info["isLoaded"] = outbreak_model is not None or optimization_model is not None
         
+        # Compile the simulation kernels now instead of on the first request
+        if NUMBA_AVAILABLE:
+            simulate_prediction_core(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0)
+            simulate_optimization_core(0, 0, 0, 0)
+        
     except Exception as e:
         logger.error(f"Error loading models: {e}")
         model_info["isLoaded"] = False
@@ -186,25 +202,51 @@ async def predict_batch(request: BatchPredictionRequest):
         logger.error(f"Batch prediction error: {e}")
         raise HTTPException(status_code=500, detail="Batch prediction failed")
 
-def simulate_prediction(input_data: MLPredictionInput) -> MLPredictionOutput:
-    """Simulate prediction when model is not available"""
-    risk_level = min(100, max(0, 
-        30 + (input_data.temperature - 20) * 0.5 + 
-        (input_data.humidity - 50) * 0.3 + 
-        input_data.previousCases * 0.8 + 
-        input_data.wastewaterLevels * 0.6
+def timestamp_seed(timestamp: str) -> int:
+    """Convert an ISO timestamp into epoch seconds, or 0 if it can't be parsed"""
+    try:
+        return int(datetime.fromisoformat(timestamp).timestamp())
+    except ValueError:
+        return 0
+
+@njit(cache=True, fastmath=True)
+def simulate_prediction_core(temperature, humidity, population_density, previous_cases,
+                             wastewater_levels, sentiment, seed):
+    """Return (risk_level, predicted_cases, confidence) for simulate_prediction"""
+    risk_level = min(100.0, max(0.0, 
+        30 + (temperature - 20) * 0.5 + 
+        (humidity - 50) * 0.3 + 
+        previous_cases * 0.8 + 
+        wastewater_levels * 0.6
     ))
     
-    predicted_cases = max(0, 
-        input_data.previousCases * 1.1 + 
-        (input_data.populationDensity / 1000) * 0.5 +
-        (input_data.socialMediaSentiment - 0.5) * 10
+    predicted_cases = max(0.0, 
+        previous_cases * 1.1 + 
+        (population_density / 1000) * 0.5 +
+        (sentiment - 0.5) * 10
+    )
+    
+    # Knuth multiplicative hash: reproducible across processes, unlike hash()
+    confidence = 70.0 + ((seed * 2654435761) & 0xFFFFFFFF) % 25
+    
+    return risk_level, predicted_cases, confidence
+
+def simulate_prediction(input_data: MLPredictionInput) -> MLPredictionOutput:
+    """Simulate prediction when model is not available"""
+    risk_level, predicted_cases, confidence = simulate_prediction_core(
+        input_data.temperature,
+        input_data.humidity,
+        input_data.populationDensity,
+        float(input_data.previousCases),
+        input_data.wastewaterLevels,
+        input_data.socialMediaSentiment,
+        timestamp_seed(input_data.timestamp)
     )
     
     return MLPredictionOutput(
         riskLevel=risk_level,
         predictedCases=predicted_cases,
-        confidence=min(95, 70 + (hash(str(input_data.timestamp)) % 25)),
+        confidence=confidence,
         featureImportance={
             "temperature": 0.85,
             "humidity": 0.72,
@@ -215,13 +257,32 @@ def simulate_prediction(input_data: MLPredictionInput) -> MLPredictionOutput:
         }
     )
 
+# The kernels compile to int64 arithmetic; Pydantic accepts larger ints, which stay in Python
+_NUMBA_INT_LIMIT = 2 ** 62
+
+def fits_numba_int(*values: int) -> bool:
+    """True if every value fits the kernels' int64 arithmetic with room to spare"""
+    return all(-_NUMBA_INT_LIMIT < value < _NUMBA_INT_LIMIT for value in values)
+
+@njit(cache=True)
+def simulate_optimization_core(beds, nurses, doctors, equipment):
+    """Return the simulated (beds, nurses, doctors, equipment) allocation"""
+    return min(100, beds + 5), min(150, nurses + 10), min(50, doctors + 2), min(100, equipment + 3)
+
 def simulate_optimization(input_data: OptimizationInput) -> OptimizationOutput:
     """Simulate optimization when model is not available"""
+    resources = (input_data.beds, input_data.nurses, input_data.doctors, input_data.equipment)
+    if fits_numba_int(*resources):
+        beds, nurses, doctors, equipment = simulate_optimization_core(*resources)
+    else:
+        # Same math uncompiled, on Python's arbitrary-precision ints
+        core = getattr(simulate_optimization_core, "py_func", simulate_optimization_core)
+        beds, nurses, doctors, equipment = core(*resources)
     optimized_allocation = {
-        "beds": min(100, input_data.beds + 5),
-        "nurses": min(150, input_data.nurses + 10),
-        "doctors": min(50, input_data.doctors + 2),
-        "equipment": min(100, input_data.equipment + 3)
+        "beds": beds,
+        "nurses": nurses,
+        "doctors": doctors,
+        "equipment": equipment
     }
     
     expected_improvements = {
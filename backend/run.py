@@ -2,25 +2,38 @@
 """
 Run script for OutbreakGuardian ML API
 """
+import importlib.util
 import uvicorn
 import os
-from main import app
 
 if __name__ == "__main__":
     # Get configuration from environment variables
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", 8000))
     reload = os.getenv("RELOAD", "true").lower() == "true"
+    workers = int(os.getenv("UVICORN_WORKERS", "1"))
+    
+    # uvicorn can't reload with multiple worker processes
+    if workers > 1 and reload:
+        print("⚠️ RELOAD is ignored when UVICORN_WORKERS > 1")
+        reload = False
     
     print(f"🚀 Starting OutbreakGuardian ML API on {host}:{port}")
     print(f"📊 API Documentation: http://{host}:{port}/docs")
     print(f"🔍 Health Check: http://{host}:{port}/health")
+    print(f"👷 Workers: {workers}")
     
     uvicorn.run(
         "main:app",
         host=host,
         port=port,
         reload=reload,
-        log_level="info"
+        workers=workers,
+        # C event loop and HTTP parser; uvloop isn't available on Windows
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        # Per-request access lines cost a logging call each; keep them off
+        access_log=False,
+        log_level=os.getenv("LOG_LEVEL", "warning")
     )
 